@@ -67,15 +67,21 @@ http_codes_and_exceptions = [
     (http.client.NOT_FOUND, NotFoundError),
     (http.client.BAD_REQUEST, UsageError),
 ]
+# Lookup tables derived from the list above.
+_http_code_to_exception = dict(http_codes_and_exceptions)
+_exception_to_http_code = {
+    exception_type: code for code, exception_type in http_codes_and_exceptions
+}
 
 
 def exception_to_http_error(e):
     """
     Returns the appropriate HTTP error code and message for the given exception.
     """
-    for known_code, exception_type in http_codes_and_exceptions:
-        if isinstance(e, exception_type):
-            return known_code, str(e)
+    # The MRO lists the most specific class first, which preserves the ordering above.
+    for cls in type(e).__mro__:
+        if cls in _exception_to_http_code:
+            return _exception_to_http_code[cls], str(e)
     return http.client.INTERNAL_SERVER_ERROR, str(e)
 
 
@@ -83,9 +89,9 @@ def http_error_to_exception(code, message):
     """
     Returns the appropriate exception for the given HTTP error code and message.
     """
-    for known_code, exception_type in http_codes_and_exceptions:
-        if code == known_code:
-            return exception_type(message)
+    exception_type = _http_code_to_exception.get(code)
+    if exception_type is not None:
+        return exception_type(message)
     if code >= 400 and code < 500:
         return UsageError(message)
     return Exception(message)
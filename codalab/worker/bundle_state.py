@@ -31,9 +31,11 @@ class State(object):
     # Assigned worker has gone offline
     WORKER_OFFLINE = 'worker_offline'
 
-    OPTIONS = {CREATED, STAGED, MAKING, STARTING, RUNNING, READY, FAILED, PREPARING, FINALIZING}
-    ACTIVE_STATES = {MAKING, STARTING, RUNNING, FINALIZING, PREPARING}
-    FINAL_STATES = {READY, FAILED, KILLED}
+    OPTIONS = frozenset(
+        {CREATED, STAGED, MAKING, STARTING, RUNNING, READY, FAILED, PREPARING, FINALIZING}
+    )
+    ACTIVE_STATES = frozenset({MAKING, STARTING, RUNNING, FINALIZING, PREPARING})
+    FINAL_STATES = frozenset({READY, FAILED, KILLED})
 
 
 # Used to uniquely identify dependencies on a worker. We don't use child features here since
@@ -108,7 +108,7 @@ def get_nvidia_devices():
     )
     # Get newline delimited gpu-index, gpu-uuid list
     output = output.decode()
-    print(output.split('\n')[:-1])
+    logger.debug('NVIDIA devices: %s', output.split('\n')[:-1])
     return {gpu.split(',')[0].strip(): gpu.split(',')[1].strip() for gpu in output.split('\n')[:-1]}
 
 
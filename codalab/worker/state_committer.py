@@ -16,6 +16,8 @@ class BaseStateCommitter(object):
 class JsonStateCommitter(BaseStateCommitter):
     def __init__(self, json_path):
         self._state_file = json_path
+        # Serialized state from the last commit, used to skip rewriting an unchanged state
+        self._last_committed = None  # type: Optional[bytes]
 
     def load(self, default=None):
         try:
@@ -25,8 +27,15 @@ class JsonStateCommitter(BaseStateCommitter):
             return dict() if default is None else default
 
     def commit(self, state):
-        """ Write out the state in JSON format to a temporary file and rename it into place """
+        """
+        Write out the state in JSON format to a temporary file and rename it into place.
+        Nothing is written if the state hasn't changed since the last commit.
+        """
+        serialized = pyjson.dumps(state).encode()
+        if serialized == self._last_committed:
+            return
         with tempfile.NamedTemporaryFile() as f:
-            f.write(pyjson.dumps(state).encode())
+            f.write(serialized)
             f.flush()
             shutil.copyfile(f.name, self._state_file)
+        self._last_committed = serialized
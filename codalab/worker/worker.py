@@ -1,13 +1,11 @@
 import logging
 import os
 import shutil
-from subprocess import PIPE, Popen
 import threading
 import time
 import traceback
 import socket
 import http.client
-import sys
 
 import psutil
 
@@ -347,18 +345,19 @@ class Worker:
 
     def process_runs(self):
         """ Transition each run then filter out finished runs """
-        # 1. transition all runs
-        for uuid in self.runs:
-            run_state = self.runs[uuid]
-            self.runs[uuid] = self.run_state_manager.transition(run_state)
-
-        # 2. filter out finished runs and clean up containers
-        finished_container_ids = [
-            run.container
-            for run in self.runs.values()
-            if (run.stage == RunStage.FINISHED or run.stage == RunStage.FINALIZING)
-            and run.container_id is not None
-        ]
+        # 1. transition all runs and collect the containers of finished runs in the same pass.
+        # Transitioned states are written back in place (no keys are added or removed) so that
+        # assign_cpu_and_gpu_sets sees the runs that already started during this pass.
+        finished_container_ids = []
+        for uuid, run_state in self.runs.items():
+            run_state = self.run_state_manager.transition(run_state)
+            self.runs[uuid] = run_state
+            if (
+                run_state.stage == RunStage.FINISHED or run_state.stage == RunStage.FINALIZING
+            ) and run_state.container_id is not None:
+                finished_container_ids.append(run_state.container_id)
+
+        # 2. clean up containers of finished runs
         for container_id in finished_container_ids:
             try:
                 container = self.docker.containers.get(container_id)
@@ -366,12 +365,13 @@ class Worker:
             except (docker.errors.NotFound, docker.errors.NullResource):
                 pass
 
-        # 3. reset runs for the current worker
-        self.runs = {
-            uuid: run_state
-            for uuid, run_state in self.runs.items()
-            if run_state.stage != RunStage.FINISHED
-        }
+        # 3. drop finished runs from the current worker. Only a few runs finish per pass, so delete
+        # them in place rather than copying every remaining run into a new dict.
+        finished_uuids = [
+            uuid for uuid, run_state in self.runs.items() if run_state.stage == RunStage.FINISHED
+        ]
+        for uuid in finished_uuids:
+            del self.runs[uuid]
 
     def assign_cpu_and_gpu_sets(self, request_cpus, request_gpus):
         """
@@ -438,26 +438,12 @@ class Worker:
         """
         Available disk space by bytes of this RunManager.
         """
-        error_msg = "Failed to run command {}".format("df " + self.work_dir)
+        # shutil.disk_usage reports the same statvfs figure as the "Available" column of df
+        # (blocks available to unprivileged users), without forking a df process per checkin.
         try:
-            p = Popen(["df", self.work_dir], stdout=PIPE)
-            output, error = p.communicate()
-            # Return None when there is an error.
-            if error:
-                logger.error(error.strip())
-                return None
-
-            if output:
-                lines = output.decode().split("\n")
-                headers = lines[0].split()
-                # The machine being attached as a worker may be using a different language other than
-                # English, so check the 4th header if "Available" is not present.
-                index = headers.index("Available") if "Available" in headers else 3
-                # We convert the original result from df command in unit of 1KB blocks into bytes.
-                return int(lines[1].split()[index]) * 1024
-
-        except Exception as e:
-            logger.error("{}: {}".format(error_msg, str(e)))
+            return shutil.disk_usage(self.work_dir).free
+        except OSError as e:
+            logger.error("Failed to get disk usage of {}: {}".format(self.work_dir, str(e)))
             return None
 
     def initialize_run(self, bundle, resources):
@@ -508,10 +494,7 @@ class Worker:
                 is_restaged=False,
             )
         else:
-            print(
-                'Bundle {} no longer assigned to this worker'.format(bundle['uuid']),
-                file=sys.stdout,
-            )
+            logger.info('Bundle %s no longer assigned to this worker', bundle['uuid'])
 
     def kill(self, uuid):
         """
@@ -529,7 +512,10 @@ class Worker:
         """
         Marks the run with uuid as finalized so it might be purged from the worker state
         """
-        self.runs[uuid] = self.runs[uuid]._replace(finalized=True)
+        run_state = self.runs[uuid]
+        if run_state.finalized:
+            return
+        self.runs[uuid] = run_state._replace(finalized=True)
 
     def read(self, socket_id, uuid, path, args):
         def reply(err, message={}, data=None):
@@ -588,13 +574,19 @@ class Worker:
         threading.Thread(target=netcat_fn).start()
 
     def write(self, uuid, path, string):
+        """
+        Writes `string` (str or bytes) to `path` inside the bundle of the run with `uuid`.
+        Writes to dependency mount points are ignored.
+        """
         run_state = self.runs[uuid]
-        if os.path.normpath(path) in set(dep.child_path for dep in run_state.bundle.dependencies):
+        normalized_path = os.path.normpath(path)
+        if any(dep.child_path == normalized_path for dep in run_state.bundle.dependencies):
             return
+        data = string.encode() if isinstance(string, str) else string
 
         def write_fn():
-            with open(os.path.join(run_state.bundle_path, path), 'w') as f:
-                f.write(string)
+            with open(os.path.join(run_state.bundle_path, normalized_path), 'wb') as f:
+                f.write(data)
 
         threading.Thread(target=write_fn).start()
 
@@ -1,6 +1,3 @@
-import argparse
-import boto3
-import json
 import logging
 import os
 import uuid
@@ -45,6 +42,10 @@ class AWSBatchWorkerManager(WorkerManager):
 
     def __init__(self, args):
         super().__init__(args)
+        # Imported here so that loading the worker manager CLI (e.g. to build its argument
+        # parser) doesn't pay for boto3/botocore unless an AWS Batch manager is actually used.
+        import boto3
+
         self.batch_client = boto3.client('batch', region_name=self.args.region)
 
     def get_worker_jobs(self):
@@ -91,8 +91,9 @@ def should_build_image(args, image):
     return False
 
 
-def main():
-    args = CodalabArgs.get_args()
+def main(argv=None):
+    """Runs codalab_service.py with the given command-line arguments (defaults to sys.argv)."""
+    args = CodalabArgs.get_args(argv)
     service_manager = CodalabServiceManager(args)
     service_manager.execute()
 
@@ -442,12 +443,12 @@ class CodalabArgs(object):
         return parser
 
     @classmethod
-    def get_args(cls):
+    def get_args(cls, argv=None):
         parser = cls._get_parser()
         args = argparse.Namespace()
 
         # Set from command-line arguments
-        parser.parse_args(namespace=args)
+        parser.parse_args(argv, namespace=args)
 
         # Set from environment variables
         for arg in CODALAB_ARGUMENTS:
@@ -3,133 +3,579 @@ Script to run both frontend and backend tests for CodaLab. Depending on the test
 will also create a second instance of CodaLab to test against.
 """
 
-from test_cli import TestModule
+from codalab_service import (
+    BASE_DIR as CODALAB_SERVICE_BASE_DIR,
+    clean_version,
+    main as codalab_service_main,
+    SERVICE_TO_IMAGE,
+)
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 import argparse
-import random
+import asyncio
+import codecs
+import fcntl
+import functools
+import itertools
+import json
+import os
+import re
+import shutil
 import socket
-import string
 import subprocess
 import sys
 import time
+import urllib.parse
+
+try:
+    import docker
+except ImportError:
+    docker = None
 
 
 class TestRunner(object):
-    _CODALAB_SERVICE_SCRIPT = 'codalab_service.py'
-    _TEMP_INSTANCE_NEEDED_TESTS = ['all', 'default', 'copy']
+    _TEMP_INSTANCE_NEEDED_TESTS = frozenset(['all', 'default', 'copy'])
+    # Backend tests that create the worksheets the frontend tests look for
+    _FRONTEND_FIXTURE_TESTS = frozenset(['all', 'default', 'worksheets'])
+    # Records the idle temp instances kept by --reuse-temp-instance so later runs can reuse them
+    _TEMP_INSTANCE_POOL_FILE = '.codalab_test_runner_pool.json'
+    # Maximum number of idle temp instances kept per version
+    _TEMP_INSTANCE_POOL_SIZE = 2
+    # Idle temp instances older than this are stopped rather than reused, so they don't linger and
+    # don't keep serving an image that has since been rebuilt
+    _TEMP_INSTANCE_POOL_TTL_SECONDS = 6 * 60 * 60
+    # Marks that the server image of a version is known to be on this host
+    _IMAGE_MARKER_FILE = '.codalab_image_cache_{}.marker'
+    _GOLDEN_HOME_NAME = 'temp-instance-golden-{}'
+    # Run by _wait_until_ready inside the main rest-server container; exits with 0 once the REST
+    # server at host:port answers an HTTP request, or with 1 after `timeout` seconds
+    _READY_PROBE = '''
+import http.client, sys, time
+host, port, timeout = sys.argv[1], int(sys.argv[2]), float(sys.argv[3])
+# One connection is reused by all the probes; after a failed probe it reconnects on the next request
+connection = http.client.HTTPConnection(host, port, timeout=0.25)
+deadline = time.time() + timeout
+delay = 0.05
+while True:
+    try:
+        connection.request('GET', '/rest/account/css')
+        connection.getresponse().read()
+        # Any HTTP response means the server is up
+        sys.exit(0)
+    except (http.client.HTTPException, OSError):
+        connection.close()
+    if time.time() + delay > deadline:
+        sys.exit(1)
+    time.sleep(delay)
+    delay = min(delay * 2, 2)
+'''
+
+    # Versions whose golden home this process has already made sure of
+    _init_done_versions = set()
+    # Distinguishes the temp instances created by this process
+    _temp_instance_counter = itertools.count()
+
+    @staticmethod
+    def _new_temp_instance_name():
+        """
+        Returns a name that no other temp instance on this host uses: the pid tells processes apart,
+        and the counter and the clock tell apart instances of this process and of earlier
+        processes that had the same pid.
+        """
+        return 'temp-instance%d-%04x-%d' % (
+            os.getpid(),
+            int(time.time() * 1000) & 0xFFFF,
+            next(TestRunner._temp_instance_counter),
+        )
 
     @staticmethod
-    def _docker_exec(command):
-        return 'docker exec -it codalab_rest-server_1 /bin/bash -c "{}"'.format(command)
+    def _docker_exec(argv):
+        """
+        Returns the argv that runs `argv` directly (no shell, no TTY) in the main rest-server.
+        This goes through the docker CLI rather than the shared Docker client so the exec is a local
+        process whose output the asyncio relay can stream. Killing that process doesn't stop
+        `argv`, so anything that needs a time limit must enforce it inside the container.
+        """
+        return ['docker', 'exec', 'codalab_rest-server_1'] + argv
 
     @staticmethod
-    def _create_temp_instance(name, version):
-        def get_free_ports(num_ports):
-            socks = [socket.socket(socket.AF_INET, socket.SOCK_STREAM) for _ in range(num_ports)]
-            for s in socks:
-                # When binding a socket to port 0, the kernel will assign it a free port
-                s.bind(('', 0))
-            ports = [str(s.getsockname()[1]) for s in socks]
-            for s in socks:
-                # Queue up to 10 requests
-                s.listen(10)
-            return ports
+    def _compose_project(instance_name):
+        """
+        Returns the docker-compose project name of the instance `instance_name`, normalized the way
+        docker-compose does it (lowercased, without characters it doesn't allow).
+        """
+        return re.sub(r'[^-_a-z0-9]', '', instance_name.lower())
 
-        rest_port, http_port = get_free_ports(2)
-        instance = 'http://rest-server:%s' % rest_port
-        print('Creating another CodaLab instance {} at {} for testing...'.format(name, instance))
+    @staticmethod
+    def _rest_server_container(instance_name):
+        return '{}_rest-server_1'.format(TestRunner._compose_project(instance_name))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _docker_client():
+        """
+        Returns the Docker client shared by all the container operations of this process, so they
+        reuse one connection to the daemon, or None if the docker package isn't installed.
+        """
+        return None if docker is None else docker.from_env()
+
+    @staticmethod
+    def _rest_server_ip(name):
+        """
+        Returns the IP of the REST server of the instance `name` on the rest-server Docker network,
+        or None if it isn't running.
+        """
+        client = TestRunner._docker_client()
+        if client is not None:
+            try:
+                container = client.containers.get(TestRunner._rest_server_container(name))
+            except docker.errors.NotFound:
+                return None
+            network = container.attrs['NetworkSettings']['Networks'].get('rest-server', {})
+            return network.get('IPAddress') or None
 
         try:
-            start_time = time.time()
-            subprocess.check_call(
-                ' '.join(
-                    [
-                        'python3',
-                        TestRunner._CODALAB_SERVICE_SCRIPT,
-                        'start',
-                        '--instance-name %s' % name,
-                        '--rest-port %s' % rest_port,
-                        '--version %s' % version,
-                        '--services init rest-server',
-                    ]
+            ip = subprocess.check_output(
+                [
+                    'docker',
+                    'inspect',
+                    '--format',
+                    '{{(index .NetworkSettings.Networks "rest-server").IPAddress}}',
+                    TestRunner._rest_server_container(name),
+                ],
+                stderr=subprocess.DEVNULL,
+            )
+        except subprocess.CalledProcessError:
+            return None
+        return ip.decode().strip() or None
+
+    @staticmethod
+    @contextmanager
+    def _temp_instance_pool():
+        """
+        Yields the list of idle temp instances kept by --reuse-temp-instance, each a dict with
+        their name, instance, version and the time they were returned to the pool, and saves it
+        back afterwards. The pool file is locked meanwhile so that concurrent runs never take the
+        same instance.
+        """
+        with open(TestRunner._TEMP_INSTANCE_POOL_FILE, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                pool = json.load(f)
+            except ValueError:
+                pool = []
+            yield pool
+            f.seek(0)
+            f.truncate()
+            json.dump(pool, f)
+
+    @staticmethod
+    def _acquire_pooled_temp_instance(version):
+        """
+        Takes an idle temp instance for `version` out of the pool and returns its (name, instance),
+        or None if there is none. Instances that are no longer running are evicted on the way, and
+        instances that have been idle for longer than _TEMP_INSTANCE_POOL_TTL_SECONDS are stopped.
+        """
+        with TestRunner._temp_instance_pool() as pool:
+            running = []
+            for entry in pool:
+                if (
+                    time.time() - entry.get('released_at', 0)
+                    > TestRunner._TEMP_INSTANCE_POOL_TTL_SECONDS
+                ):
+                    print('Stopping the expired pooled temp instance {}...'.format(entry['name']))
+                    TestRunner._stop_instance(entry['name'])
+                    continue
+                ip = TestRunner._rest_server_ip(entry['name'])
+                if ip is None:
+                    continue
+                # The REST server may have moved to another IP since it was pooled (e.g. after a
+                # restart), so address it by its current one
+                port = urllib.parse.urlparse(entry['instance']).port
+                entry['instance'] = 'http://%s:%s' % (ip, port)
+                running.append(entry)
+            pool[:] = running
+            for i, entry in enumerate(pool):
+                if entry['version'] == version:
+                    del pool[i]
+                    return entry['name'], entry['instance']
+        return None
+
+    @staticmethod
+    def _release_pooled_temp_instance(name, instance, version):
+        """
+        Returns the temp instance to the pool. Returns False without adding it if the pool already
+        holds enough idle instances for `version`, in which case the caller should stop it.
+        """
+        with TestRunner._temp_instance_pool() as pool:
+            idle = sum(1 for entry in pool if entry['version'] == version)
+            if idle >= TestRunner._TEMP_INSTANCE_POOL_SIZE:
+                return False
+            pool.append(
+                {
+                    'name': name,
+                    'instance': instance,
+                    'version': version,
+                    'released_at': time.time(),
+                }
+            )
+        return True
+
+    @staticmethod
+    def _wait_until_ready(ip, rest_port, timeout):
+        """
+        Polls the REST server at `ip` with exponential backoff until it answers an HTTP request.
+        Returns whether it did so within `timeout` seconds.
+        The polling runs in the main rest-server container, since container IPs on the rest-server
+        network aren't reachable from the host everywhere (e.g. on Docker Desktop).
+        """
+        return (
+            subprocess.call(
+                TestRunner._docker_exec(
+                    ['python3', '-c', TestRunner._READY_PROBE, ip, str(rest_port), str(timeout)]
                 ),
-                shell=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            == 0
+        )
+
+    @staticmethod
+    def _ensure_server_image(version):
+        """
+        Makes sure the image that the temp instance's services run on is on this host, pulling it
+        up front if needed, and leaves a marker file so later runs skip even the image inspect.
+        """
+        version = clean_version(version)
+        marker = TestRunner._IMAGE_MARKER_FILE.format(version)
+        if os.path.exists(marker):
+            return
+        image = 'codalab/{}:{}'.format(SERVICE_TO_IMAGE['rest-server'], version)
+        image_present = (
+            subprocess.call(
+                ['docker', 'image', 'inspect', image],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
             )
+            == 0
+        )
+        if not image_present:
+            print('Pulling {} for the temp instance...'.format(image))
+            subprocess.check_call(['docker', 'pull', image])
+        open(marker, 'w').close()
+
+    @staticmethod
+    def _reserve_free_port():
+        """
+        Returns a (port, socket) pair. The port stays reserved until the socket is closed, so
+        other processes can't take it while we're getting ready to start the service.
+        """
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Let the service bind the port right after we release it, even if it is in TIME_WAIT
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # When binding a socket to port 0, the kernel will assign it a free port
+        s.bind(('', 0))
+        return str(s.getsockname()[1]), s
+
+    @staticmethod
+    def _instance_home(name):
+        """Returns the CodaLab home of the instance `name` (see var_path in codalab_service.py)."""
+        return os.path.join(CODALAB_SERVICE_BASE_DIR, 'var', name, 'home')
+
+    @staticmethod
+    def _start_instance(name, rest_port, version, services):
+        # Run codalab_service.py in-process to save starting another interpreter for it
+        codalab_service_main(
+            [
+                'start',
+                '--instance-name',
+                name,
+                '--rest-port',
+                rest_port,
+                '--version',
+                version,
+                '--services',
+            ]
+            + services
+        )
+
+    @staticmethod
+    def _stop_instance(name):
+        if docker is None:
+            codalab_service_main(['stop', '--instance-name', name])
+            return
+
+        # Equivalent to `codalab_service.py stop`, which runs `docker-compose stop` on the
+        # instance's compose project, but stops all of its containers in parallel.
+        containers = TestRunner._docker_client().containers.list(
+            filters={'label': 'com.docker.compose.project=%s' % TestRunner._compose_project(name)}
+        )
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda container: container.stop(), containers))
+
+    @staticmethod
+    def _golden_home(version):
+        """
+        Returns where the golden CodaLab home of `version` is kept: the home of the first temp
+        instance of that version, saved right after the init service ran on it. Later temp instances
+        start from a copy of it instead of running all the init steps again. The database is the
+        shared MySQL server on the rest-server network, so the home (config.json and CLI state) is
+        all there is to copy.
+        """
+        return TestRunner._instance_home(
+            TestRunner._GOLDEN_HOME_NAME.format(clean_version(version))
+        )
+
+    @staticmethod
+    def _start_temp_instance(name, rest_port, rest_port_holder, version):
+        """
+        Starts the temp instance `name` on the reserved `rest_port`, from a copy of the golden home
+        of `version` if there is one. Otherwise starts it with the init service and saves its home
+        as the golden home.
+        """
+        golden_home = TestRunner._golden_home(version)
+        if version not in TestRunner._init_done_versions:
+            # The lock file keeps temp instances created at the same time, by this or another
+            # process, from initializing and saving the golden home concurrently
+            lock_dir = os.path.dirname(golden_home)
+            os.makedirs(lock_dir, exist_ok=True)
+            with open(os.path.join(lock_dir, 'golden.lock'), 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                if not os.path.exists(os.path.join(golden_home, '.golden')):
+                    rest_port_holder.close()
+                    TestRunner._start_instance(name, rest_port, version, ['init', 'rest-server'])
+                    print(
+                        'Saving the home of {} as the golden home {}...'.format(name, golden_home)
+                    )
+                    shutil.rmtree(golden_home, ignore_errors=True)
+                    shutil.copytree(TestRunner._instance_home(name), golden_home)
+                    open(os.path.join(golden_home, '.golden'), 'w').close()
+                    TestRunner._init_done_versions.add(version)
+                    return
+            TestRunner._init_done_versions.add(version)
+
+        TestRunner._clone_golden_home(golden_home, name, rest_port)
+        # Release the port only now, right before the service binds it
+        rest_port_holder.close()
+        TestRunner._start_instance(name, rest_port, version, ['rest-server'])
+
+    @staticmethod
+    def _clone_golden_home(golden_home, name, rest_port):
+        """Copies the golden CodaLab home to the instance `name` serving on `rest_port`."""
+        home = TestRunner._instance_home(name)
+        shutil.copytree(golden_home, home, ignore=shutil.ignore_patterns('.golden'))
+        # Point the copied config at the new instance, as the init service would have done
+        config_path = os.path.join(home, 'config.json')
+        with open(config_path) as f:
+            config = json.load(f)
+        config['cli']['default_address'] = 'http://rest-server:%s' % rest_port
+        config['server']['rest_port'] = int(rest_port)
+        with open(config_path, 'w') as f:
+            json.dump(config, f, indent=4, sort_keys=True)
+
+    @staticmethod
+    def _create_temp_instances(names, version, ready_timeout):
+        """
+        Creates a temp instance for each of `names` and returns their instance URLs, in the same
+        order. The instances are created in parallel, once the server image is on this host.
+        """
+        try:
+            start_time = time.time()
+            TestRunner._ensure_server_image(version)
+            with ThreadPoolExecutor(max_workers=len(names)) as executor:
+                instances = list(
+                    executor.map(
+                        lambda name: TestRunner._create_temp_instance(name, version, ready_timeout),
+                        names,
+                    )
+                )
             print(
-                'It took {} seconds to create the temp instance.'.format(time.time() - start_time)
+                'It took {} seconds to create the temp instance(s).'.format(
+                    time.time() - start_time
+                )
             )
-        except subprocess.CalledProcessError as ex:
-            print('There was an error while creating the temp instance: %s' % ex.output)
+        except Exception as ex:
+            # check_call doesn't capture output, and codalab_service raises plain exceptions
+            print('There was an error while creating the temp instance(s): %s' % ex)
             raise
 
+        return instances
+
+    @staticmethod
+    def _create_temp_instance(name, version, ready_timeout):
+        rest_port, rest_port_holder = TestRunner._reserve_free_port()
+        print('Creating another CodaLab instance {} for testing...'.format(name))
+        TestRunner._start_temp_instance(name, rest_port, rest_port_holder, version)
+
+        # Address the instance by its REST server's IP on the rest-server network rather than by
+        # the `rest-server` hostname, so neither the probe below nor the tests have to look it up.
+        ip = TestRunner._rest_server_ip(name)
+        if ip is None:
+            raise Exception('The REST server of {} is not running'.format(name))
+        instance = 'http://%s:%s' % (ip, rest_port)
+        # Without the init service, `start` returns as soon as the containers are up, so make sure
+        # the REST server is serving before tests are pointed at it.
+        if not TestRunner._wait_until_ready(ip, rest_port, timeout=ready_timeout):
+            TestRunner._stop_instance(name)
+            raise Exception(
+                'The REST server of {} did not come up within {} seconds'.format(
+                    name, ready_timeout
+                )
+            )
+        print('CodaLab instance {} is at {}'.format(name, instance))
         return instance
 
     def __init__(self, args):
         self.instance = args.instance
         self.tests = args.tests
+        self.backend_timeout = args.backend_timeout
+        self.frontend_timeout = args.frontend_timeout
 
         # Check if a second, temporary instance of CodaLab is needed for testing
-        self.temp_instance_required = any(
-            test in self.tests for test in TestRunner._TEMP_INSTANCE_NEEDED_TESTS
+        self.temp_instance_required = not TestRunner._TEMP_INSTANCE_NEEDED_TESTS.isdisjoint(
+            self.tests
         )
+        # With --reuse-temp-instance, temp instances come from and go back to a pool of running
+        # instances instead of being created and stopped by every run
+        self.pool_temp_instance = args.reuse_temp_instance
+        self.version = args.version
         if self.temp_instance_required:
-            self.temp_instance_name = 'temp-instance%s' % ''.join(
-                random.choice(string.digits) for _ in range(8)
-            )
-            self.temp_instance = TestRunner._create_temp_instance(
-                self.temp_instance_name, args.version
+            pooled = (
+                TestRunner._acquire_pooled_temp_instance(args.version)
+                if self.pool_temp_instance
+                else None
             )
+            if pooled:
+                self.temp_instance_name, self.temp_instance = pooled
+                print(
+                    'Reusing CodaLab instance {} at {} for testing...'.format(
+                        self.temp_instance_name, self.temp_instance
+                    )
+                )
+            else:
+                self.temp_instance_name = TestRunner._new_temp_instance_name()
+                [self.temp_instance] = TestRunner._create_temp_instances(
+                    [self.temp_instance_name], args.version, args.create_timeout
+                )
 
-    def run(self):
-        success = True
-        try:
-            # Run backend tests using test_cli
-            test_command = 'python3 test_cli.py --instance %s ' % self.instance
-            if self.temp_instance_required:
-                test_command += '--second-instance %s ' % self.temp_instance
-            test_command += ' '.join(list(filter(lambda test: test != 'frontend', self.tests)))
+    async def run(self):
+        # Run backend tests using test_cli
+        test_command = ['python3', 'test_cli.py', '--instance', self.instance]
+        if self.temp_instance_required:
+            test_command += ['--second-instance', self.temp_instance]
+        test_command += [test for test in self.tests if test != 'frontend']
+
+        print('Running backend tests with command: %s' % ' '.join(test_command))
+        # Killing the `docker exec` client wouldn't stop the tests inside the container, so they are
+        # limited there. The local limit is only a backstop in case the exec itself hangs.
+        backend_command = TestRunner._docker_exec(
+            ['timeout', '--kill-after=10', str(self.backend_timeout)] + test_command
+        )
+        commands = {'backend': (backend_command, self.backend_timeout + 30)}
+        # Selenium UI tests
+        frontend_command = (
+            ['python3', 'tests/ui/ui_tester.py', '--headless'],
+            self.frontend_timeout,
+        )
 
-            print('Running backend tests with command: %s' % test_command)
-            subprocess.check_call(TestRunner._docker_exec(test_command), shell=True)
+        try:
+            if 'frontend' not in self.tests:
+                return await TestRunner._run_concurrently(commands)
+            if TestRunner._FRONTEND_FIXTURE_TESTS.isdisjoint(self.tests):
+                # Run frontend tests at the same time, they don't depend on these backend tests
+                print('Running frontend tests...')
+                commands['frontend'] = frontend_command
+                return await TestRunner._run_concurrently(commands)
 
-            # Run frontend tests
-            self._run_frontend_tests()
+            # The UI tests need the sample worksheets that the backend tests create, so only run
+            # them once the backend tests have passed
+            if not await TestRunner._run_concurrently(commands):
+                return False
+            print('Running frontend tests...')
+            return await TestRunner._run_concurrently({'frontend': frontend_command})
+        finally:
+            self._cleanup()
 
-        except subprocess.CalledProcessError as ex:
-            print('Exception while executing tests: %s' % ex.output)
-            success = False
+    @staticmethod
+    async def _run_concurrently(commands):
+        """
+        Runs the given {name: (argv, timeout)} in parallel and returns whether all of them
+        succeeded. Output is relayed line by line; when several commands run, each line is prefixed
+        with the name of the command that produced it. A command still running after its timeout
+        (in seconds) is killed and counts as failed.
+        """
 
-        self._cleanup()
-        return success
+        async def relay_output(process, prefix):
+            # Relay fixed-size chunks rather than lines, which asyncio can only read up to its
+            # stream limit, and prefix the start of each line
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            at_line_start = True
+            while True:
+                chunk = await process.stdout.read(65536)
+                if not chunk:
+                    break
+                for line in decoder.decode(chunk).splitlines(keepends=True):
+                    sys.stdout.write(prefix + line if at_line_start else line)
+                    at_line_start = line.endswith('\n')
+                sys.stdout.flush()
+            return await process.wait()
 
-    def _run_frontend_tests(self):
-        if 'frontend' not in self.tests:
-            return
+        async def run_command(name, command, timeout):
+            prefix = '[%s] ' % name if len(commands) > 1 else ''
+            process = await asyncio.create_subprocess_exec(
+                *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+            )
+            try:
+                returncode = await asyncio.wait_for(relay_output(process, prefix), timeout=timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                print(
+                    'Exception while executing tests: %s timed out after %d seconds'
+                    % (' '.join(command), timeout)
+                )
+                return False
+            except Exception as ex:
+                process.kill()
+                await process.wait()
+                print(
+                    'Exception while executing tests: relaying the output of %s failed: %s'
+                    % (' '.join(command), ex)
+                )
+                return False
+            if returncode != 0:
+                print(
+                    'Exception while executing tests: %s exited with code %d'
+                    % (' '.join(command), returncode)
+                )
+            return returncode == 0
 
-        # Execute front end tests here
-        print('Running frontend tests...')
-        # Run Selenium UI tests
-        subprocess.check_call('python3 tests/ui/ui_tester.py --headless', shell=True)
+        results = await asyncio.gather(
+            *[run_command(name, command, timeout) for name, (command, timeout) in commands.items()]
+        )
+        return all(results)
 
     def _cleanup(self):
         if not self.temp_instance_required:
             return
 
+        if self.pool_temp_instance and TestRunner._release_pooled_temp_instance(
+            self.temp_instance_name, self.temp_instance, self.version
+        ):
+            print('Returned the temp instance {} to the pool.'.format(self.temp_instance_name))
+            return
+
         print('Shutting down the temp instance {}...'.format(self.temp_instance_name))
-        subprocess.check_call(
-            ' '.join(
-                [
-                    'python3',
-                    TestRunner._CODALAB_SERVICE_SCRIPT,
-                    'stop',
-                    '--instance-name %s' % self.temp_instance_name,
-                ]
-            ),
-            shell=True,
-        )
+        TestRunner._stop_instance(self.temp_instance_name)
 
 
 if __name__ == '__main__':
+    # test_cli is only needed for the names of the test modules, so it isn't imported along with
+    # TestRunner itself
+    from test_cli import TestModule
+
     parser = argparse.ArgumentParser(
         description='Runs the specified tests against the specified CodaLab instance (defaults to localhost)'
     )
@@ -145,6 +591,32 @@ if __name__ == '__main__':
         help='CodaLab instance to run tests against, defaults to "http://rest-server:2900"',
         default='http://rest-server:2900',
     )
+    parser.add_argument(
+        '--reuse-temp-instance',
+        action='store_true',
+        help='Take the temp instance for multi-instance tests from a pool of instances left '
+        'running by previous runs with this flag, and return it to the pool afterwards, instead '
+        'of creating and stopping a new one',
+    )
+    parser.add_argument(
+        '--backend-timeout',
+        type=int,
+        help='Seconds after which the backend tests are killed and fail, defaults to 3600',
+        default=3600,
+    )
+    parser.add_argument(
+        '--frontend-timeout',
+        type=int,
+        help='Seconds after which the frontend tests are killed and fail, defaults to 3600',
+        default=3600,
+    )
+    parser.add_argument(
+        '--create-timeout',
+        type=int,
+        help='Seconds to wait for the REST server of a new temp instance to answer HTTP requests '
+        'once its containers are started (instance setup itself is not limited), defaults to 60',
+        default=60,
+    )
     parser.add_argument(
         'tests',
         metavar='TEST',
@@ -156,5 +628,5 @@ if __name__ == '__main__':
 
     args = parser.parse_args()
     test_runner = TestRunner(args)
-    if not test_runner.run():
+    if not asyncio.get_event_loop().run_until_complete(test_runner.run()):
         sys.exit(1)
@@ -0,0 +1,40 @@
+import http.client
+import unittest
+
+from codalab.common import (
+    exception_to_http_error,
+    http_error_to_exception,
+    NotFoundError,
+    PermissionError,
+    UsageError,
+)
+
+
+class CommonTest(unittest.TestCase):
+    def test_exception_to_http_error(self):
+        """Exceptions map to the code of their most specific known class"""
+        self.assertEqual(
+            exception_to_http_error(NotFoundError('missing')), (http.client.NOT_FOUND, 'missing')
+        )
+        self.assertEqual(
+            exception_to_http_error(UsageError('bad')), (http.client.BAD_REQUEST, 'bad')
+        )
+
+        class CustomNotFoundError(NotFoundError):
+            pass
+
+        self.assertEqual(
+            exception_to_http_error(CustomNotFoundError('gone'))[0], http.client.NOT_FOUND
+        )
+        self.assertEqual(
+            exception_to_http_error(ValueError('oops'))[0], http.client.INTERNAL_SERVER_ERROR
+        )
+
+    def test_http_error_to_exception(self):
+        """HTTP codes map back to the matching exception class"""
+        self.assertIsInstance(
+            http_error_to_exception(http.client.FORBIDDEN, 'denied'), PermissionError
+        )
+        e = http_error_to_exception(http.client.CONFLICT, 'conflict')
+        self.assertIs(type(e), UsageError)
+        self.assertIs(type(http_error_to_exception(http.client.BAD_GATEWAY, 'down')), Exception)
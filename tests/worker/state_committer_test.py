@@ -31,6 +31,15 @@ class JsonStateCommitterTest(unittest.TestCase):
         with open(self.state_path) as f:
             self.assertEqual(test_state_json_str, f.read())
 
+    def test_commit_unchanged(self):
+        """Make sure an unchanged state is not rewritten but a changed one is"""
+        self.committer.commit({'state': 'value'})
+        os.remove(self.state_path)
+        self.committer.commit({'state': 'value'})
+        self.assertFalse(os.path.exists(self.state_path))
+        self.committer.commit({'state': 'new value'})
+        self.assertDictEqual({'state': 'new value'}, self.committer.load())
+
     def test_load(self):
         """ Make sure load loads the state file if it exists """
         test_state = {'state': 'value'}